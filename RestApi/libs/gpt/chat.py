@@ -1,11 +1,17 @@
-from .client import client, DEFAULT_MODEL, read_prompt_file
-from ..supaclient import supabase_client
+from .client import get_client, DEFAULT_MODEL, read_prompt_file
+from ..supaclient import get_supabase_client, pagination
 import models
 from typing import List, Union
+from functools import lru_cache
 import json
 
 
-SYSTEM_PROMPT = read_prompt_file("chat")
+@lru_cache(maxsize=None)
+def get_system_prompt() -> str:
+    """
+    Read the system prompt once, on first use.
+    """
+    return read_prompt_file("chat")
 
 USER_MESSAGE_PROMPT_TEMPLATE = """
 User message: "{}"
@@ -41,7 +47,7 @@ def prepare_last_test_results(
         models.TestResult: A list of test results for the user.
     """
     response = (
-        supabase_client.table("test_results")
+        get_supabase_client().table("test_results")
         .select("*")
         .eq("user_id", user_id)
         .order("created_at", desc=True)
@@ -66,7 +72,7 @@ def prerare_last_mood(
         models.TestResult: The last mood for the user.
     """
     response = (
-        supabase_client.table("moods")
+        get_supabase_client().table("moods")
         .select("*")
         .eq("user_id", user_id)
         .order("created_at", desc=True)
@@ -107,24 +113,18 @@ def load_memory(
         user_id: str,
         limit: int = 6
 ) -> List[models.Message]:
-    # Reading previous messages
-    response = (
-        supabase_client.table("chat_messages")
-        .select("*")
-        .eq("user_id", user_id)
-        .order("created_at", desc=True)
-        .limit(limit)
-        .execute()
+    # Reading previous messages, newest page first, then back to chronological order
+    rows, _ = pagination.fetch_page(
+        table="chat_messages",
+        user_id=user_id,
+        limit=limit
     )
 
-    if not response.data:
-        return list()
-
     return [
         models.Message(
             role=message["role"],
             content=message["message"]
-        ) for message in response.data
+        ) for message in reversed(rows)
         if message["role"] in [models.MessageRole.user, models.MessageRole.bot]
     ]
 
@@ -163,9 +163,9 @@ def message(
     ]
 
 
-    response = client.responses.create(
+    response = get_client().responses.create(
         model=DEFAULT_MODEL,
-        instructions=SYSTEM_PROMPT,
+        instructions=get_system_prompt(),
         input=exported_conversation
 
     )
@@ -1,18 +1,38 @@
-from openai import OpenAI
+from typing import TYPE_CHECKING, Optional
 import os
+import threading
 from pathlib import Path
 
+if TYPE_CHECKING:
+    from openai import OpenAI
 
-client = OpenAI(
-    api_key=os.environ.get("OPENAI_API_KEY"),
-)
+
+# Shared client, created on first use so importing `libs` stays cheap
+client: Optional["OpenAI"] = None
+_client_lock = threading.Lock()
 
 DEFAULT_MODEL = "gpt-4o-mini"
 
-DATA_DIR = Path() / "data"
+# Resolved from the package location, not the current working directory
+DATA_DIR = Path(__file__).resolve().parents[2] / "data"
 PROMPTS_DIR = DATA_DIR / "prompts"
 
 
+def get_client() -> "OpenAI":
+    """
+    Returns the shared OpenAI client (singleton pattern)
+    """
+    global client
+    if client is None:
+        with _client_lock:
+            if client is None:
+                from openai import OpenAI
+                client = OpenAI(
+                    api_key=os.environ.get("OPENAI_API_KEY"),
+                )
+    return client
+
+
 def read_prompt_file(name: str) -> str:
     """
     Read the prompt file and return its content.
@@ -20,4 +40,4 @@ def read_prompt_file(name: str) -> str:
     file_path = PROMPTS_DIR / f"{name}.txt"
     with open(file_path, "r") as file:
         data = file.read()
-    return data
\ No newline at end of file
+    return data
@@ -1,4 +1,5 @@
-from .supaclient import supabase_client
+from .supaclient import get_supabase_client
+from . import pagination
 
 
-__all__ = ["supabase_client"]
+__all__ = ["get_supabase_client", "pagination"]
@@ -0,0 +1,131 @@
+from .supaclient import get_supabase_client
+from typing import Iterator, List, Optional, Tuple
+from datetime import datetime
+import base64
+import json
+import re
+
+
+# Cursor values end up in a PostgREST filter string, so only ids that
+# cannot contain filter syntax are accepted
+ROW_ID_PATTERN = re.compile(
+    r"\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+)
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(created_at: str, row_id) -> str:
+    """
+    Encode the (created_at, id) position of a row into an opaque cursor.
+    """
+    raw = json.dumps([created_at, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, object]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+    Raises:
+        InvalidCursorError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as ex:
+        raise InvalidCursorError("Invalid cursor") from ex
+
+    if not isinstance(created_at, str) or isinstance(row_id, bool) or not isinstance(row_id, (str, int)):
+        raise InvalidCursorError("Invalid cursor")
+
+    try:
+        datetime.fromisoformat(created_at)
+    except ValueError as ex:
+        raise InvalidCursorError("Invalid cursor") from ex
+
+    if not ROW_ID_PATTERN.fullmatch(str(row_id)):
+        raise InvalidCursorError("Invalid cursor")
+    return created_at, row_id
+
+
+def fetch_page(
+        table: str,
+        user_id: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        columns: str = "*",
+    ) -> Tuple[List[dict], Optional[str]]:
+    """
+    Read one page of a user's rows, newest first, using a keyset on (created_at, id).
+    Args:
+        table (str): The table name.
+        user_id (str): The ID of the user.
+        limit (int): The maximum number of rows in the page.
+        cursor (str, optional): The cursor returned with the previous page.
+        columns (str, optional): The columns to select. Must include created_at and id.
+    Returns:
+        Tuple[List[dict], Optional[str]]: The rows and the cursor of the next page (None on the last page).
+    """
+    query = (
+        get_supabase_client().table(table)
+        .select(columns)
+        .eq("user_id", user_id)
+    )
+
+    if cursor is not None:
+        created_at, row_id = decode_cursor(cursor)
+        # The range bound lets Postgres use the (user_id, created_at, id) index
+        query = query.lte("created_at", created_at).or_(
+            f'created_at.lt."{created_at}",'
+            f'and(created_at.eq."{created_at}",id.lt."{row_id}")'
+        )
+
+    # One extra row tells whether there is a next page without a count query
+    rows = (
+        query
+        .order("created_at", desc=True)
+        .order("id", desc=True)
+        .limit(limit + 1)
+        .execute()
+    ).data or list()
+
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last["created_at"], last["id"])
+
+
+def iter_rows(
+        table: str,
+        user_id: str,
+        page_size: int = 500,
+        columns: str = "*",
+    ) -> Iterator[List[dict]]:
+    """
+    Iterate over all of a user's rows page by page, newest first.
+    Only one page is held in memory at a time.
+    Args:
+        table (str): The table name.
+        user_id (str): The ID of the user.
+        page_size (int, optional): The number of rows per read. Defaults to 500.
+        columns (str, optional): The columns to select. Must include created_at and id.
+    Yields:
+        List[dict]: The rows of the next page.
+    """
+    cursor = None
+    while True:
+        rows, cursor = fetch_page(
+            table=table,
+            user_id=user_id,
+            limit=page_size,
+            cursor=cursor,
+            columns=columns
+        )
+        if rows:
+            yield rows
+        if cursor is None:
+            return
@@ -1,10 +1,29 @@
-from supabase import create_client, Client
+from typing import TYPE_CHECKING, Optional
 import os
+import threading
 from dotenv import load_dotenv
 load_dotenv()
 
+if TYPE_CHECKING:
+    from supabase import Client
 
-supabase_client: Client = create_client(
-    supabase_url=os.getenv("SUPABASE_URL"),
-    supabase_key=os.getenv("SUPABASE_SECRET")
-    )
+
+# Shared client, created on first use so importing `libs` stays cheap
+supabase_client: Optional["Client"] = None
+_client_lock = threading.Lock()
+
+
+def get_supabase_client() -> "Client":
+    """
+    Returns the shared Supabase client (singleton pattern)
+    """
+    global supabase_client
+    if supabase_client is None:
+        with _client_lock:
+            if supabase_client is None:
+                from supabase import create_client
+                supabase_client = create_client(
+                    supabase_url=os.getenv("SUPABASE_URL"),
+                    supabase_key=os.getenv("SUPABASE_SECRET")
+                    )
+    return supabase_client
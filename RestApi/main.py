@@ -1,82 +1,71 @@
-from fastapi import FastAPI, Request, UploadFile, File, Depends, Form
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.security import HTTPAuthorizationCredentials
-from libs.jwt_token import HTTPUserBearer, JWTUser
-from libs.supaclient import supabase_client
-from libs import gpt
-import models
-from emotion_predictor import predict_emotion
+from fastapi.middleware.gzip import GZipMiddleware
+import importlib
 import logging
-import utils
+import os
 
 
 logging.basicConfig(level=logging.INFO)
 
-app = FastAPI()
-auth_scheme = HTTPUserBearer()
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # 🔓 Allow all origins
-    allow_credentials=True,
-    allow_methods=["*"],  # 🔓 Allow all HTTP methods
-    allow_headers=["*"],  # 🔓 Allow all headers
-)
-
-
-
-
-
-@app.post("/rescore", response_model=models.NoteResultsResponse)
-async def rescore(
-    message: str,
-    emotion: models.EmotionType,
-    user: HTTPAuthorizationCredentials = Depends(auth_scheme),
-) -> models.NoteResultsResponse:
-    if not utils.is_user_premium(user):
-        return utils.return_error(status_code=401, message="User is not premium")
-
-    rescored_emotion: models.NoteResultsResponse = predict_emotion(
-        text=message,
+# Route modules per worker role. Modules are imported only for the selected
+# role, so a chat-only worker never loads torch/transformers.
+ROLE_ROUTES = {
+    "chat": ["routes.chat", "routes.export"],
+    "inference": ["routes.inference"],
+    "all": ["routes.chat", "routes.export", "routes.inference"],
+}
+DEFAULT_ROLE = "all"
+# Responses that are already compressed or must stream untouched
+GZIP_EXCLUDED_PATHS = ["/export"]
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """
+    GZip middleware that passes excluded paths through as is.
+    """
+    def __init__(self, app, exclude_paths: list = (), **kwargs):
+        super().__init__(app, **kwargs)
+        self.exclude_paths = set(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+def create_app(role: str = None) -> FastAPI:
+    """
+    Create the application for the given worker role.
+    Args:
+        role (str, optional): "chat", "inference" or "all". Defaults to the APP_ROLE env variable, then "all".
+    Returns:
+        FastAPI: The configured application.
+    """
+    role = role or os.getenv("APP_ROLE", DEFAULT_ROLE)
+    if role not in ROLE_ROUTES:
+        raise ValueError(f"Unknown app role: {role}")
+
+    app = FastAPI()
+    app.state.role = role
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # 🔓 Allow all origins
+        allow_credentials=True,
+        allow_methods=["*"],  # 🔓 Allow all HTTP methods
+        allow_headers=["*"],  # 🔓 Allow all headers
+        expose_headers=["ETag"],
     )
-    print(rescored_emotion)
-
-    note_id = supabase_client.table("moods").insert({
-        "user_id": user.user_id,
-        "note": message,
-        "selected_emotion": emotion,
-        "calculated_confidence": rescored_emotion.confidence,
-        "calculated_emotion": rescored_emotion.emotion_type
-    }).execute().data[0]["id"]
-
-    return rescored_emotion
+    # Only large history pages are worth compressing
+    app.add_middleware(SelectiveGZipMiddleware, minimum_size=1024, exclude_paths=GZIP_EXCLUDED_PATHS)
 
+    for module_name in ROLE_ROUTES[role]:
+        app.include_router(importlib.import_module(module_name).router)
 
-@app.post("/chat", response_model=models.ChatMessageResponse)
-async def message(
-    message: str,
-    user: HTTPAuthorizationCredentials = Depends(auth_scheme)
-):
-    if not utils.is_user_premium(user):
-        return utils.return_error(status_code=401, message="User is not premium")
-    
-    output_text: str = gpt.message(
-        user_id=user.user_id,
-        text=message
-    )
-
-    supabase_client.table("chat_messages").insert({
-        "user_id": user.user_id,
-        "message": message,
-        "role": models.MessageRole.user
-    }).execute()
+    logging.info("Application created with role: %s", role)
+    return app
 
-    supabase_client.table("chat_messages").insert({
-        "user_id": user.user_id,
-        "message": output_text,
-        "role": models.MessageRole.bot
-    }).execute()
 
-    return models.ChatMessageResponse(
-        message=output_text
-    )
\ No newline at end of file
+app = create_app()
@@ -1,5 +1,6 @@
 from enum import StrEnum
 from pydantic import BaseModel
+from typing import List, Optional, Union
 
 
 class EmotionType(StrEnum):
@@ -55,3 +56,32 @@ class Mood(BaseModel):
     note: str
     calculated_emotion: EmotionType
     calculated_confidence: float
+    created_at: Optional[str] = None
+
+
+class ChatMessage(BaseModel):
+    id: Union[str, int]
+    role: MessageRole
+    message: str
+    created_at: str
+
+
+class ChatHistoryPage(BaseModel):
+    items: List[ChatMessage]
+    next_cursor: Optional[str] = None
+
+
+class MoodHistoryPage(BaseModel):
+    items: List[Mood]
+    next_cursor: Optional[str] = None
+
+
+class ExportFormat(StrEnum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class ExportTable(StrEnum):
+    moods = "moods"
+    test_results = "test_results"
+    chat_messages = "chat_messages"
@@ -0,0 +1,94 @@
+from fastapi import APIRouter, Request, Depends, Query
+from fastapi.security import HTTPAuthorizationCredentials
+from libs.jwt_token import HTTPUserBearer
+from libs.supaclient import get_supabase_client, pagination
+from typing import Optional
+from libs import gpt
+import models
+import utils
+
+
+router = APIRouter()
+auth_scheme = HTTPUserBearer()
+
+HISTORY_PAGE_SIZE = 20
+HISTORY_MAX_PAGE_SIZE = 100
+
+
+@router.post("/chat", response_model=models.ChatMessageResponse)
+async def message(
+    message: str,
+    user: HTTPAuthorizationCredentials = Depends(auth_scheme)
+):
+    if not utils.is_user_premium(user):
+        return utils.return_error(status_code=401, message="User is not premium")
+    
+    output_text: str = gpt.message(
+        user_id=user.user_id,
+        text=message
+    )
+
+    get_supabase_client().table("chat_messages").insert({
+        "user_id": user.user_id,
+        "message": message,
+        "role": models.MessageRole.user
+    }).execute()
+
+    get_supabase_client().table("chat_messages").insert({
+        "user_id": user.user_id,
+        "message": output_text,
+        "role": models.MessageRole.bot
+    }).execute()
+
+    return models.ChatMessageResponse(
+        message=output_text
+    )
+
+
+@router.get("/chat/history", response_model=models.ChatHistoryPage)
+def chat_history(
+    request: Request,
+    limit: int = Query(HISTORY_PAGE_SIZE, ge=1, le=HISTORY_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    user: HTTPAuthorizationCredentials = Depends(auth_scheme)
+):
+    try:
+        rows, next_cursor = pagination.fetch_page(
+            table="chat_messages",
+            user_id=user.user_id,
+            limit=limit,
+            cursor=cursor,
+            columns="id,role,message,created_at"
+        )
+    except pagination.InvalidCursorError:
+        return utils.return_error(status_code=400, message="Invalid cursor")
+
+    page = models.ChatHistoryPage(
+        items=[models.ChatMessage(**row) for row in rows],
+        next_cursor=next_cursor
+    )
+    return utils.cached_json_response(request, page)
+
+
+@router.get("/moods", response_model=models.MoodHistoryPage)
+def moods(
+    request: Request,
+    limit: int = Query(HISTORY_PAGE_SIZE, ge=1, le=HISTORY_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    user: HTTPAuthorizationCredentials = Depends(auth_scheme)
+):
+    try:
+        rows, next_cursor = pagination.fetch_page(
+            table="moods",
+            user_id=user.user_id,
+            limit=limit,
+            cursor=cursor
+        )
+    except pagination.InvalidCursorError:
+        return utils.return_error(status_code=400, message="Invalid cursor")
+
+    page = models.MoodHistoryPage(
+        items=[models.Mood(**row) for row in rows],
+        next_cursor=next_cursor
+    )
+    return utils.cached_json_response(request, page)
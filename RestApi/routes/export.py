@@ -0,0 +1,132 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials
+from libs.jwt_token import HTTPUserBearer
+from libs.supaclient import pagination
+from typing import Iterable, Iterator, List, Optional
+import models
+import utils
+import csv
+import io
+import json
+import zlib
+
+
+router = APIRouter()
+auth_scheme = HTTPUserBearer()
+
+EXPORT_PAGE_SIZE = 500
+
+# Fixed column order keeps the CSV header stable between exports
+EXPORT_COLUMNS = {
+    models.ExportTable.moods: [
+        "id", "created_at", "selected_emotion", "calculated_emotion",
+        "calculated_confidence", "note",
+    ],
+    models.ExportTable.test_results: [
+        "id", "created_at", "total_score", "depression_score",
+        "anxiety_score", "stress_score",
+    ],
+    models.ExportTable.chat_messages: [
+        "id", "created_at", "role", "message",
+    ],
+}
+
+MEDIA_TYPES = {
+    models.ExportFormat.ndjson: "application/x-ndjson",
+    models.ExportFormat.csv: "text/csv",
+}
+
+
+def iter_table_pages(
+        user_id: str,
+        table: models.ExportTable
+    ) -> Iterator[List[dict]]:
+    return pagination.iter_rows(
+        table=table,
+        user_id=user_id,
+        page_size=EXPORT_PAGE_SIZE,
+        columns=",".join(EXPORT_COLUMNS[table])
+    )
+
+
+def export_ndjson(
+        user_id: str,
+        tables: List[models.ExportTable]
+    ) -> Iterator[bytes]:
+    """
+    Yield one NDJSON chunk per page read; every record carries its table name.
+    """
+    for table in tables:
+        for rows in iter_table_pages(user_id, table):
+            yield "".join(
+                json.dumps({"table": table, **row}, separators=(",", ":"), ensure_ascii=False) + "\n"
+                for row in rows
+            ).encode()
+
+
+def export_csv(
+        user_id: str,
+        table: models.ExportTable
+    ) -> Iterator[bytes]:
+    """
+    Yield the CSV header, then one CSV chunk per page read.
+    """
+    columns = EXPORT_COLUMNS[table]
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+
+    writer.writeheader()
+    for rows in iter_table_pages(user_id, table):
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Compress a stream of chunks into a single gzip stream on the fly.
+    """
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+@router.get("/export")
+async def export(
+    format: models.ExportFormat = models.ExportFormat.ndjson,
+    table: Optional[models.ExportTable] = None,
+    gzip: bool = False,
+    user: HTTPAuthorizationCredentials = Depends(auth_scheme)
+):
+    # The generators do blocking Supabase reads, so the response is iterated
+    # in the threadpool and each page is read only after the previous chunk
+    # has been sent to the client.
+    tables = [table] if table else list(models.ExportTable)
+
+    if format == models.ExportFormat.csv:
+        if table is None:
+            return utils.return_error(status_code=400, message="CSV export requires a table")
+        chunks = export_csv(user.user_id, table)
+    else:
+        chunks = export_ndjson(user.user_id, tables)
+
+    filename = f"{table or 'export'}.{format}"
+    media_type = MEDIA_TYPES[format]
+    if gzip:
+        chunks = gzip_chunks(chunks)
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
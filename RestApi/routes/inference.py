@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends
+from fastapi.security import HTTPAuthorizationCredentials
+from libs.jwt_token import HTTPUserBearer
+from libs.supaclient import get_supabase_client
+import models
+from emotion_predictor import predict_emotion, get_emotion_predictor
+from shadow_scoring import get_shadow_scorer, start_shadow_scorer
+import utils
+import time
+
+
+# The shadow scorer process is started with the app, not on the first request
+router = APIRouter(on_startup=[start_shadow_scorer])
+auth_scheme = HTTPUserBearer()
+
+
+@router.post("/rescore", response_model=models.NoteResultsResponse)
+async def rescore(
+    message: str,
+    emotion: models.EmotionType,
+    user: HTTPAuthorizationCredentials = Depends(auth_scheme),
+) -> models.NoteResultsResponse:
+    if not utils.is_user_premium(user):
+        return utils.return_error(status_code=401, message="User is not premium")
+
+    # Model loading happens before the timer, as it does for the candidate
+    get_emotion_predictor()
+    start = time.perf_counter()
+    rescored_emotion: models.NoteResultsResponse = predict_emotion(
+        text=message,
+    )
+    primary_latency_ms = (time.perf_counter() - start) * 1000
+    print(rescored_emotion)
+
+    # Candidate model scores a sample in the background, never on this request
+    shadow_scorer = get_shadow_scorer()
+    if shadow_scorer is not None:
+        shadow_scorer.submit(message, rescored_emotion, primary_latency_ms)
+
+    note_id = get_supabase_client().table("moods").insert({
+        "user_id": user.user_id,
+        "note": message,
+        "selected_emotion": emotion,
+        "calculated_confidence": rescored_emotion.confidence,
+        "calculated_emotion": rescored_emotion.emotion_type
+    }).execute().data[0]["id"]
+
+    return rescored_emotion
@@ -0,0 +1,259 @@
+from typing import Callable, Optional
+from pathlib import Path
+from functools import partial
+import models
+import logging
+import multiprocessing
+import os
+import queue
+import random
+import sqlite3
+import threading
+import time
+
+logging.basicConfig(level=logging.INFO)
+
+
+SHADOW_DB_PATH = Path(__file__).parent / "data" / "shadow_scores.sqlite3"
+DEFAULT_SAMPLE_RATE = 0.1
+DEFAULT_QUEUE_SIZE = 256
+DEFAULT_NUM_THREADS = 1
+# Нижчий пріоритет процесу кандидата, щоб він не забирав CPU в основної моделі
+SHADOW_NICE = 10
+
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS shadow_scores (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    primary_emotion TEXT NOT NULL,
+    candidate_emotion TEXT NOT NULL,
+    agreement INTEGER NOT NULL,
+    primary_confidence REAL NOT NULL,
+    candidate_confidence REAL NOT NULL,
+    confidence_delta REAL NOT NULL,
+    primary_latency_ms REAL NOT NULL,
+    candidate_latency_ms REAL NOT NULL,
+    candidate_num_threads INTEGER NOT NULL,
+    candidate_nice INTEGER NOT NULL
+)
+"""
+
+
+def load_candidate_predictor(model_path: str, num_threads: int = DEFAULT_NUM_THREADS):
+    """
+    Завантажує кандидатну модель з обмеженою кількістю потоків torch
+    (викликається у процесі кандидата)
+    """
+    import torch
+    from emotion_predictor import EmotionPredictor
+
+    torch.set_num_threads(num_threads)
+    return EmotionPredictor(model_path)
+
+
+def _run_worker(
+        predictor_factory: Callable,
+        db_path: Path,
+        work_queue,
+        failed,
+        num_threads: int,
+    ):
+    """
+    Цикл процесу кандидата: читає нотатки з черги та записує порівняння в SQLite
+    """
+    try:
+        # До імпорту torch, щоб обмежити потоки OpenMP/MKL
+        os.environ["OMP_NUM_THREADS"] = str(num_threads)
+        os.environ["MKL_NUM_THREADS"] = str(num_threads)
+        nice = os.nice(SHADOW_NICE) if hasattr(os, "nice") else 0
+
+        connection = sqlite3.connect(db_path)
+        connection.execute(CREATE_TABLE_SQL)
+        connection.commit()
+        predictor = predictor_factory()
+        logging.info("Кандидатна модель для shadow-скорінгу завантажена")
+    except Exception:
+        logging.exception("Не вдалося запустити shadow-скорінг, його вимкнено")
+        failed.set()
+        # Звільняємо нотатки, що встигли потрапити в чергу
+        while True:
+            try:
+                work_queue.get_nowait()
+            except queue.Empty:
+                return
+            work_queue.task_done()
+
+    while True:
+        text, primary_emotion, primary_confidence, primary_latency_ms = work_queue.get()
+        try:
+            start = time.perf_counter()
+            emotion_type, confidence = predictor.predict_emotion_with_confidence(text)
+            candidate_latency_ms = (time.perf_counter() - start) * 1000
+            connection.execute(
+                "INSERT INTO shadow_scores (created_at, primary_emotion, candidate_emotion, agreement, "
+                "primary_confidence, candidate_confidence, confidence_delta, "
+                "primary_latency_ms, candidate_latency_ms, candidate_num_threads, candidate_nice) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    time.time(),
+                    primary_emotion,
+                    str(emotion_type),
+                    int(str(emotion_type) == primary_emotion),
+                    primary_confidence,
+                    confidence,
+                    confidence - primary_confidence,
+                    primary_latency_ms,
+                    candidate_latency_ms,
+                    num_threads,
+                    nice,
+                )
+            )
+            connection.commit()
+        except Exception:
+            logging.exception("Помилка shadow-скорінгу")
+        finally:
+            work_queue.task_done()
+
+
+class ShadowScorer:
+    def __init__(
+            self,
+            predictor_factory: Callable,
+            db_path: Path = SHADOW_DB_PATH,
+            sample_rate: float = DEFAULT_SAMPLE_RATE,
+            queue_size: int = DEFAULT_QUEUE_SIZE,
+            num_threads: int = DEFAULT_NUM_THREADS,
+        ):
+        """
+        Скорінг кандидатної моделі в окремому процесі
+
+        Кандидат працює в окремому процесі з нижчим пріоритетом і обмеженою
+        кількістю потоків torch, тому не конкурує з основною моделлю за GIL.
+        Цей процес тримає в пам'яті власну копію кандидатної моделі.
+        Через ці обмеження затримка кандидата не порівнюється напряму
+        із затримкою основної моделі; обмеження записуються з кожним рядком.
+
+        Args:
+            predictor_factory (Callable): Створює кандидатний предиктор у процесі кандидата (має серіалізуватися pickle)
+            db_path (Path): Шлях до локальної бази результатів
+            sample_rate (float): Частка нотаток, що відправляються кандидату (0-1)
+            queue_size (int): Максимальний розмір черги; при переповненні нотатки відкидаються
+            num_threads (int): Кількість потоків torch у процесі кандидата
+        """
+        self.predictor_factory = predictor_factory
+        self.db_path = Path(db_path)
+        self.sample_rate = sample_rate
+        self.num_threads = num_threads
+        # spawn: дочірній процес не успадковує стан torch/потоків сервера
+        self._context = multiprocessing.get_context("spawn")
+        self.queue = self._context.JoinableQueue(maxsize=queue_size)
+        self.failed = self._context.Event()
+        self.dropped = 0
+        self._worker: Optional[multiprocessing.Process] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """
+        Запускає процес кандидата (один раз)
+        """
+        with self._lock:
+            if self._worker is None:
+                self._worker = self._context.Process(
+                    target=_run_worker,
+                    args=(self.predictor_factory, self.db_path, self.queue, self.failed, self.num_threads),
+                    name="shadow-scorer",
+                    daemon=True,
+                )
+                self._worker.start()
+
+    @property
+    def disabled(self) -> bool:
+        """
+        True, якщо процес кандидата не запустився або завершився
+        """
+        if self.failed.is_set():
+            return True
+        return self._worker is not None and not self._worker.is_alive()
+
+    def submit(
+            self,
+            text: str,
+            primary: models.NoteResultsResponse,
+            primary_latency_ms: float
+        ) -> bool:
+        """
+        Ставить нотатку у чергу кандидата без блокування основного запиту
+
+        Returns:
+            bool: True, якщо нотатку поставлено в чергу
+        """
+        if random.random() >= self.sample_rate or self.disabled:
+            return False
+        try:
+            self.queue.put_nowait((
+                text,
+                str(primary.emotion_type),
+                primary.confidence,
+                primary_latency_ms,
+            ))
+        except queue.Full:
+            # Черга переповнена: відкидаємо, щоб не рости в пам'яті
+            self.dropped += 1
+            return False
+        return True
+
+    def summary(self) -> dict:
+        """
+        Повертає агреговані результати порівняння моделей
+
+        mean_candidate_latency_ms виміряна з обмеженнями candidate_num_threads
+        та candidate_nice, тому не є прямим порівнянням з основною моделлю.
+        """
+        with sqlite3.connect(self.db_path) as connection:
+            connection.execute(CREATE_TABLE_SQL)
+            (count, agreement, delta, primary_latency, candidate_latency,
+             candidate_num_threads, candidate_nice) = connection.execute(
+                "SELECT COUNT(*), AVG(agreement), AVG(confidence_delta), "
+                "AVG(primary_latency_ms), AVG(candidate_latency_ms), "
+                "MAX(candidate_num_threads), MAX(candidate_nice) FROM shadow_scores"
+            ).fetchone()
+        return {
+            "count": count,
+            "agreement_rate": agreement,
+            "mean_confidence_delta": delta,
+            "mean_primary_latency_ms": primary_latency,
+            "mean_candidate_latency_ms": candidate_latency,
+            "candidate_num_threads": candidate_num_threads,
+            "candidate_nice": candidate_nice,
+            "dropped": self.dropped,
+        }
+
+
+# Глобальний екземпляр (None, якщо кандидатна модель не налаштована)
+shadow_scorer = None
+shadow_model_path = os.getenv("SHADOW_MODEL_PATH")
+
+
+def start_shadow_scorer() -> Optional[ShadowScorer]:
+    """
+    Створює та запускає глобальний shadow-скорер, якщо задано SHADOW_MODEL_PATH
+    (викликається при старті застосунку)
+    """
+    global shadow_scorer
+    if shadow_scorer is None and shadow_model_path:
+        num_threads = int(os.getenv("SHADOW_NUM_THREADS", DEFAULT_NUM_THREADS))
+        shadow_scorer = ShadowScorer(
+            predictor_factory=partial(load_candidate_predictor, shadow_model_path, num_threads),
+            sample_rate=float(os.getenv("SHADOW_SAMPLE_RATE", DEFAULT_SAMPLE_RATE)),
+            queue_size=int(os.getenv("SHADOW_QUEUE_SIZE", DEFAULT_QUEUE_SIZE)),
+            num_threads=num_threads,
+        )
+        shadow_scorer.start()
+    return shadow_scorer
+
+
+def get_shadow_scorer() -> Optional[ShadowScorer]:
+    """
+    Повертає вже запущений shadow-скорер (None, якщо його не запущено)
+    """
+    return shadow_scorer
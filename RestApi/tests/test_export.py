@@ -0,0 +1,79 @@
+import pytest
+import csv
+import gzip
+import io
+import json
+from libs.supaclient import pagination
+from routes import export
+import models
+
+PAGES = {
+    "moods": [
+        [{"id": "m2", "created_at": "2025-05-02", "selected_emotion": "joy", "calculated_emotion": "joy",
+          "calculated_confidence": 0.9, "note": "good, day"}],
+        [{"id": "m1", "created_at": "2025-05-01", "selected_emotion": "fear", "calculated_emotion": "sadness",
+          "calculated_confidence": 0.4, "note": "bad"}],
+    ],
+    "test_results": [],
+    "chat_messages": [
+        [{"id": "c1", "created_at": "2025-05-01", "role": "user", "message": "hi"}],
+    ],
+}
+
+
+@pytest.fixture(autouse=True)
+def fake_pages(monkeypatch):
+    def fetch_page(table, user_id, limit, cursor=None, columns="*"):
+        pages = PAGES[table]
+        index = int(cursor) if cursor else 0
+        if index >= len(pages):
+            return [], None
+        next_cursor = str(index + 1) if index + 1 < len(pages) else None
+        return pages[index], next_cursor
+
+    monkeypatch.setattr(pagination, "fetch_page", fetch_page)
+
+def test_iter_rows_reads_all_pages():
+    pages = list(pagination.iter_rows("moods", "user"))
+    assert [row["id"] for page in pages for row in page] == ["m2", "m1"]
+
+def test_export_ndjson():
+    lines = b"".join(export.export_ndjson("user", list(models.ExportTable))).decode().splitlines()
+    records = [json.loads(line) for line in lines]
+    assert [(r["table"], r["id"]) for r in records] == [("moods", "m2"), ("moods", "m1"), ("chat_messages", "c1")]
+
+def test_export_csv():
+    chunks = list(export.export_csv("user", models.ExportTable.moods))
+    assert len(chunks) == 2
+    rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode())))
+    assert [row["id"] for row in rows] == ["m2", "m1"]
+    assert rows[0]["note"] == "good, day"
+
+def test_export_csv_empty_table_has_header():
+    data = b"".join(export.export_csv("user", models.ExportTable.test_results)).decode()
+    assert data.splitlines() == [",".join(export.EXPORT_COLUMNS[models.ExportTable.test_results])]
+
+def test_gzip_chunks():
+    data = b"".join(export.export_ndjson("user", [models.ExportTable.moods]))
+    compressed = b"".join(export.gzip_chunks(export.export_ndjson("user", [models.ExportTable.moods])))
+    assert gzip.decompress(compressed) == data
+
+def test_export_endpoint_is_gzipped_once(fake_pages):
+    from fastapi.testclient import TestClient
+    from types import SimpleNamespace
+    from main import create_app
+
+    app = create_app("chat")
+    app.dependency_overrides[export.auth_scheme] = lambda: SimpleNamespace(user_id="user")
+    client = TestClient(app)
+
+    response = client.get(
+        "/export",
+        params={"table": "moods", "gzip": "true"},
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/gzip"
+    assert "content-encoding" not in response.headers
+    lines = gzip.decompress(response.content).decode().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == ["m2", "m1"]
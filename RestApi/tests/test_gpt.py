@@ -1,8 +1,35 @@
 import pytest
+from types import SimpleNamespace
 from libs.gpt import message
+from libs.supaclient import pagination
+
+
+class EmptyQuery:
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        return SimpleNamespace(data=None)
+
 
 def test_gpt_message(monkeypatch):
-    # Мокаємо клієнта, якщо потрібно, щоб не викликати справжній OpenAI
-    monkeypatch.setattr("libs.gpt.chat.client.responses.create", lambda **kwargs: type("Resp", (), {"output_text": "test"})())
-    result = message("Hello")
-    assert isinstance(result, str)
\ No newline at end of file
+    # Мокаємо клієнтів, щоб не викликати справжні OpenAI та Supabase
+    requests = []
+
+    def create(**kwargs):
+        requests.append(kwargs)
+        return SimpleNamespace(output_text="test")
+
+    monkeypatch.setattr("libs.gpt.chat.get_client", lambda: SimpleNamespace(responses=SimpleNamespace(create=create)))
+    monkeypatch.setattr("libs.gpt.chat.get_supabase_client", lambda: SimpleNamespace(table=lambda name: EmptyQuery()))
+    monkeypatch.setattr(pagination, "fetch_page", lambda **kwargs: ([
+        {"role": "assistant", "message": "second"},
+        {"role": "user", "message": "first"},
+    ], None))
+
+    result = message(user_id="user", text="Hello")
+    assert result == "test"
+
+    conversation = requests[0]["input"]
+    assert [item["content"] for item in conversation[:2]] == ["first", "second"]
+    assert "Hello" in conversation[-1]["content"]
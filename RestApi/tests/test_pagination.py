@@ -0,0 +1,170 @@
+import pytest
+from starlette.requests import Request
+from libs.supaclient import pagination
+import models
+import utils
+
+
+def make_request(headers: dict = None) -> Request:
+    return Request({
+        "type": "http",
+        "headers": [
+            (key.lower().encode(), value.encode()) for key, value in (headers or {}).items()
+        ],
+    })
+
+ROW_ID = "3f2b1c4e-1234-4abc-9def-0123456789ab"
+CREATED_AT = "2025-05-01T10:00:00.123456+00:00"
+
+
+class FakeQuery:
+    def __init__(self, rows: list):
+        self.rows = rows
+        self.calls = []
+
+    def __getattr__(self, name):
+        def method(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return method
+
+    def execute(self):
+        return type("Response", (), {"data": self.rows})()
+
+
+@pytest.fixture
+def fake_query(monkeypatch):
+    def install(rows: list) -> FakeQuery:
+        query = FakeQuery(rows)
+        client = type("Client", (), {"table": lambda self, name: query})()
+        monkeypatch.setattr(pagination, "get_supabase_client", lambda: client)
+        return query
+    return install
+
+def make_rows(count: int) -> list:
+    return [
+        {"id": str(index), "created_at": f"2025-05-01T10:00:{59 - index:02d}+00:00"}
+        for index in range(count)
+    ]
+
+def test_cursor_roundtrip():
+    cursor = pagination.encode_cursor(CREATED_AT, ROW_ID)
+    assert pagination.decode_cursor(cursor) == (CREATED_AT, ROW_ID)
+    cursor = pagination.encode_cursor(CREATED_AT, 42)
+    assert pagination.decode_cursor(cursor) == (CREATED_AT, 42)
+
+@pytest.mark.parametrize("created_at, row_id", [
+    (CREATED_AT, 'x"),id.gt.(0'),
+    (CREATED_AT, "1,2"),
+    (CREATED_AT, True),
+    ('2025-05-01",id.gt."0', ROW_ID),
+    ("yesterday", ROW_ID),
+])
+def test_crafted_cursor_is_rejected(created_at, row_id):
+    with pytest.raises(pagination.InvalidCursorError):
+        pagination.decode_cursor(pagination.encode_cursor(created_at, row_id))
+
+def test_invalid_cursor():
+    with pytest.raises(pagination.InvalidCursorError):
+        pagination.decode_cursor("not-a-cursor")
+
+def test_fetch_page_first_page(fake_query):
+    query = fake_query(make_rows(3))
+    rows, next_cursor = pagination.fetch_page("moods", "user", limit=2)
+
+    assert [row["id"] for row in rows] == ["0", "1"]
+    assert pagination.decode_cursor(next_cursor) == (rows[-1]["created_at"], "1")
+    assert ("limit", (3,), {}) in query.calls
+    assert ("eq", ("user_id", "user"), {}) in query.calls
+    assert [call[1] for call in query.calls if call[0] == "order"] == [
+        ("created_at",), ("id",)
+    ]
+    assert not any(call[0] == "or_" for call in query.calls)
+
+def test_fetch_page_last_page(fake_query):
+    fake_query(make_rows(2))
+    rows, next_cursor = pagination.fetch_page("moods", "user", limit=2)
+    assert len(rows) == 2
+    assert next_cursor is None
+
+def test_fetch_page_keyset_filter(fake_query):
+    query = fake_query(make_rows(1))
+    pagination.fetch_page("moods", "user", limit=2, cursor=pagination.encode_cursor(CREATED_AT, ROW_ID))
+
+    assert ("lte", ("created_at", CREATED_AT), {}) in query.calls
+    assert ("or_", (
+        f'created_at.lt."{CREATED_AT}",and(created_at.eq."{CREATED_AT}",id.lt."{ROW_ID}")',
+    ), {}) in query.calls
+
+def test_cached_json_response_not_modified():
+    page = models.ChatHistoryPage(items=[], next_cursor=None)
+    response = utils.cached_json_response(make_request(), page)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    response = utils.cached_json_response(make_request({"If-None-Match": etag}), page)
+    assert response.status_code == 304
+    assert response.body == b""
+
+MOOD_ROWS = [
+    {"id": "3f2b1c4e-1234-4abc-9def-00000000000%d" % index, "user_id": "user",
+     "created_at": "2025-05-0%dT10:00:00+00:00" % (3 - index), "note": f"note {index}",
+     "selected_emotion": "joy", "calculated_emotion": "sadness",
+     "calculated_confidence": 0.5, "updated_at": "2025-05-04T10:00:00+00:00"}
+    for index in range(2)
+]
+CHAT_ROWS = [
+    {"id": index, "created_at": "2025-05-0%dT10:00:00+00:00" % (3 - index),
+     "role": "user" if index else "assistant", "message": f"message {index}"}
+    for index in range(2)
+]
+
+
+@pytest.fixture
+def history_client(monkeypatch):
+    from fastapi.testclient import TestClient
+    from types import SimpleNamespace
+    from main import create_app
+    from routes import chat
+
+    tables = {"moods": MOOD_ROWS, "chat_messages": CHAT_ROWS}
+
+    def fetch_page(table, user_id, limit, cursor=None, columns="*"):
+        rows = tables[table]
+        if cursor is not None:
+            created_at, row_id = pagination.decode_cursor(cursor)
+            rows = [row for row in rows if (row["created_at"], row["id"]) < (created_at, row_id)]
+        if len(rows) <= limit:
+            return rows, None
+        return rows[:limit], pagination.encode_cursor(rows[limit - 1]["created_at"], rows[limit - 1]["id"])
+
+    monkeypatch.setattr(pagination, "fetch_page", fetch_page)
+    app = create_app("chat")
+    app.dependency_overrides[chat.auth_scheme] = lambda: SimpleNamespace(user_id="user")
+    return TestClient(app)
+
+@pytest.mark.parametrize("path, rows, key", [
+    ("/moods", MOOD_ROWS, "note"),
+    ("/chat/history", CHAT_ROWS, "message"),
+])
+def test_history_endpoint_pages(history_client, path, rows, key):
+    first = history_client.get(path, params={"limit": 1})
+    assert first.status_code == 200
+    page = first.json()
+    assert [item[key] for item in page["items"]] == [rows[0][key]]
+    assert page["next_cursor"]
+
+    second = history_client.get(path, params={"limit": 1, "cursor": page["next_cursor"]})
+    assert second.status_code == 200
+    assert [item[key] for item in second.json()["items"]] == [rows[1][key]]
+    assert second.json()["next_cursor"] is None
+
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+    cached = history_client.get(path, params={"limit": 1}, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+
+@pytest.mark.parametrize("path", ["/moods", "/chat/history"])
+def test_history_endpoint_invalid_cursor(history_client, path):
+    response = history_client.get(path, params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
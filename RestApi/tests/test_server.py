@@ -14,3 +14,7 @@ def test_chat_unauthorized():
     assert response.status_code == 401 or response.status_code == 422
 
 # Додайте більше тестів з валідним токеном, якщо є можливість його отримати
+
+def test_chat_history_unauthorized():
+    response = client.get("/chat/history")
+    assert response.status_code in (401, 403)
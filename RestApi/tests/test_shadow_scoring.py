@@ -0,0 +1,55 @@
+import pytest
+import time
+from shadow_scoring import ShadowScorer
+import models
+
+
+class FakePredictor:
+    def predict_emotion_with_confidence(self, text: str):
+        return models.EmotionType.JOY, 0.75
+
+
+def failing_factory():
+    raise FileNotFoundError("candidate checkpoint not found")
+
+
+PRIMARY = models.NoteResultsResponse(confidence=0.5, emotion_type=models.EmotionType.JOY)
+
+def test_shadow_scorer_records_comparison(tmp_path):
+    scorer = ShadowScorer(FakePredictor, db_path=tmp_path / "shadow.sqlite3", sample_rate=1.0)
+    scorer.start()
+    assert scorer.submit("I am happy", PRIMARY, primary_latency_ms=10.0)
+
+    # Bounded wait, so a worker that fails to start cannot hang the test run
+    deadline = time.monotonic() + 30
+    while scorer.summary()["count"] == 0:
+        assert not scorer.disabled, "shadow worker failed to start"
+        assert time.monotonic() < deadline, "shadow worker did not score the note"
+        time.sleep(0.05)
+
+    summary = scorer.summary()
+    assert summary["count"] == 1
+    assert summary["candidate_num_threads"] == 1
+    assert summary["agreement_rate"] == 1
+    assert summary["mean_confidence_delta"] == pytest.approx(0.25)
+    assert summary["mean_primary_latency_ms"] == 10.0
+
+def test_shadow_scorer_drops_when_queue_is_full(tmp_path):
+    # Worker is not started, so the queue backs up
+    scorer = ShadowScorer(FakePredictor, db_path=tmp_path / "shadow.sqlite3", sample_rate=1.0, queue_size=2)
+    results = [scorer.submit("note", PRIMARY, primary_latency_ms=1.0) for _ in range(5)]
+    assert results == [True, True, False, False, False]
+    assert scorer.dropped == 3
+
+def test_shadow_scorer_sampling(tmp_path):
+    scorer = ShadowScorer(FakePredictor, db_path=tmp_path / "shadow.sqlite3", sample_rate=0.0)
+    assert not scorer.submit("note", PRIMARY, primary_latency_ms=1.0)
+
+def test_shadow_scorer_disabled_when_setup_fails(tmp_path):
+    scorer = ShadowScorer(failing_factory, db_path=tmp_path / "shadow.sqlite3", sample_rate=1.0)
+    scorer.start()
+    assert scorer.failed.wait(timeout=30)
+
+    assert scorer.disabled
+    assert not scorer.submit("note", PRIMARY, primary_latency_ms=1.0)
+    assert scorer.dropped == 0
@@ -0,0 +1,47 @@
+import pytest
+import subprocess
+import sys
+import json
+import os
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ["torch", "transformers", "openai", "supabase"]
+# Generous bound: a chat worker must not pay for the ML stack at boot
+MAX_CHAT_IMPORT_SECONDS = 3.0
+
+
+def import_main(role: str) -> dict:
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "import main\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"print(json.dumps({{'elapsed': elapsed, 'loaded': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_DIR,
+        env={**os.environ, "APP_ROLE": role},
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def test_chat_role_import_is_light():
+    result = import_main("chat")
+    print(f"chat role import time: {result['elapsed']:.3f}s")
+    assert result["loaded"] == []
+    assert result["elapsed"] < MAX_CHAT_IMPORT_SECONDS
+
+def test_chat_role_routes():
+    from main import create_app
+    paths = {route.path for route in create_app("chat").routes}
+    assert "/chat" in paths
+    assert "/rescore" not in paths
+
+def test_unknown_role():
+    from main import create_app
+    with pytest.raises(ValueError):
+        create_app("unknown")
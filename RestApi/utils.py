@@ -1,8 +1,11 @@
 import models
-from libs.supaclient import supabase_client
+from libs.supaclient import get_supabase_client, pagination
 from typing import List, Union
 from libs.jwt_token import JWTUser
+from fastapi import Request, Response
 from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+import hashlib
 
 
 def return_error(status_code: int, message: str):
@@ -20,7 +23,7 @@ def is_user_premium(user: JWTUser) -> bool:
     Check if the user is premium.
     """
     found_rows = (
-        supabase_client.table("is_premium").select("*")
+        get_supabase_client().table("is_premium").select("*")
         .eq("user_id", user.user_id)
         .eq("is_premium", True)
         .execute()
@@ -29,27 +32,51 @@ def is_user_premium(user: JWTUser) -> bool:
     return len(found_rows) > 0
 
 
+def cached_json_response(request: Request, body: BaseModel) -> Response:
+    """
+    Serialize a model to compact JSON and tag it with an ETag.
+    Returns 304 without a body if the client already has this version.
+    """
+    content: bytes = body.model_dump_json().encode()
+    # Weak: the gzip middleware may re-encode the body under the same tag
+    etag = 'W/"{}"'.format(hashlib.sha1(content).hexdigest())
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        client_etags = [
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+        ]
+        if "*" in client_etags or etag.removeprefix("W/") in client_etags:
+            return Response(status_code=304, headers=headers)
+
+    return Response(
+        content=content,
+        media_type="application/json",
+        headers=headers
+    )
+
+
 def get_conversation(
-        user_id: str
+        user_id: str,
+        limit: int = 5
     ) -> List[models.Message]:
     """
-    Get the conversation history for a user.
+    Get the latest messages of a user's conversation, oldest first.
     Args:
         user_id (str): The user ID.
+        limit (int, optional): The maximum number of messages. Defaults to 5.
     Returns:
         List[models.Message]: The conversation history.
     """
-    previous_messages = (
-        supabase_client.table("chat_messages")
-        .select("*")
-        .eq("user_id", user_id)
-        .order("created_at", desc=False)
-        .limit(5)
-        .execute()
-    ).data
+    previous_messages, _ = pagination.fetch_page(
+        table="chat_messages",
+        user_id=user_id,
+        limit=limit
+    )
 
     conversation: List[models.Message] = list()
-    for message in previous_messages:
+    for message in reversed(previous_messages):
         latest_message = models.Message(
             role=message["role"],
             content=message["message"]